@@ -1,15 +1,31 @@
 from __future__ import annotations
 
+import functools
 import logging
 import os
-from dataclasses import dataclass
+import re
+import string
+import threading
+from dataclasses import dataclass, field, replace
 from typing import Optional
-from urllib.parse import quote, unquote, urlsplit
+from urllib.parse import quote, unquote
 
 ALERT_LEVEL = 45
 
+_MISSING = object()
 
-@dataclass
+# Every environment variable the SDK reads; build_client_config_from_env
+# snapshots exactly these so identical environments hit the config cache.
+_ALSHIVAL_ENV_KEYS = (
+    "ALSHIVAL_USERNAME",
+    "ALSHIVAL_API_KEY",
+    "ALSHIVAL_RESOURCE",
+    "ALSHIVAL_RESOURCE_URL",
+    "ALSHIVAL_CLOUD_LEVEL",
+)
+
+
+@dataclass(slots=True)
 class ClientConfig:
     username: Optional[str] = None
     # Derived from `resource` URL.
@@ -25,35 +41,68 @@ class ClientConfig:
     cloud_level: Optional[int] = logging.INFO
     timeout_seconds: int = 5
     verify_ssl: bool = True
+    # Cloud delivery batching: flush after this many queued records or at
+    # this interval, whichever comes first.
+    cloud_batch_size: int = 100
+    cloud_flush_interval: float = 1.0
+    # Collapse identical consecutive records into one entry with a "count"
+    # field. Off by default to keep payloads byte-for-byte predictable.
+    cloud_dedupe: bool = False
+    # Memoized "<base><prefix>/%s/logs/" template plus the (base, prefix)
+    # pair it was computed from; maintained by build_resource_logs_endpoint.
+    _endpoint_template: Optional[str] = field(default=None, init=False, repr=False)
+    _endpoint_key: Optional[tuple] = field(default=None, init=False, repr=False)
+    # Single-slot (resource_id, url) memo for the fully composed endpoint;
+    # handlers overwhelmingly log against one resource.
+    _endpoint_cache: Optional[tuple] = field(default=None, init=False, repr=False)
+    # Memoized delivery-header items plus the (api_key, username) pair they
+    # were built from; maintained by the logger module.
+    _headers_cache: Optional[tuple] = field(default=None, init=False, repr=False)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ParsedResourceRef:
     resource_base_url: str
     resource_logs_prefix: str
     resource_id: str
 
 
+# RFC 3986 unreserved characters; fully-safe strings skip quote() entirely.
+_URL_SAFE = frozenset(string.ascii_letters + string.digits + "-._~")
+
+
+def _fast_quote(value: str) -> str:
+    if value.isascii() and _URL_SAFE.issuperset(value):
+        return value
+    return quote(value, safe="")
+
+
+# All accepted cloud-level tokens, lowercased once here so parsing is a
+# single normalize + dict probe. "none" disables cloud forwarding, hence
+# the Optional values.
+_CLOUD_LEVEL_TOKENS: dict[str, Optional[int]] = {
+    "alert": ALERT_LEVEL,
+    "alerts": ALERT_LEVEL,
+    "error": logging.ERROR,
+    "warning": logging.WARNING,
+    "info": logging.INFO,
+    "debug": logging.DEBUG,
+    "none": None,
+}
+
+
 def _coerce_level(level: str) -> Optional[int]:
+    # Levels are string tokens by contract; ints are rejected rather than
+    # passed through so typos like cloud_level=logging.ERROR fail loudly.
     if not isinstance(level, str):
         raise ValueError(f"Invalid log level: {level!r}")
-    name = level.strip().upper()
-    if name == "NONE":
-        return None
-    mapping = {
-        "ALERT": ALERT_LEVEL,
-        "ERROR": logging.ERROR,
-        "WARNING": logging.WARNING,
-        "INFO": logging.INFO,
-        "DEBUG": logging.DEBUG,
-    }
-    if name in mapping:
-        return mapping[name]
-    raise ValueError(f"Invalid log level: {level!r}")
-
-
-def _env_level(name: str, default: Optional[int]) -> Optional[int]:
-    value = os.getenv(name)
+    value = _CLOUD_LEVEL_TOKENS.get(level.strip().lower(), _MISSING)
+    if value is _MISSING:
+        raise ValueError(f"Invalid log level: {level!r}")
+    return value
+
+
+def _env_level(value: Optional[str], default: Optional[int]) -> Optional[int]:
     if value is None or value.strip() == "":
         return default
     try:
@@ -63,40 +112,59 @@ def _env_level(name: str, default: Optional[int]) -> Optional[int]:
         return default
 
 
+# Optional trailing "logs" segment dropped before extracting the resource id.
+_TRAILING_LOGS_RE = re.compile(r"/+\s*logs\s*/*$", re.IGNORECASE)
+# First full "resources" segment plus the id that follows it; everything up to
+# and including "resources" is the logs prefix, any remainder is ignored.
+_RESOURCE_PATH_RE = re.compile(
+    r"^(?P<prefix>(?:/+[^/]+)*?/+\s*resources\s*)/+(?P<rid>[^/]+)(?:/.*)?$",
+    re.IGNORECASE,
+)
+
+
+@functools.lru_cache(maxsize=8)
 def _parse_resource_reference(resource: Optional[str]) -> Optional[ParsedResourceRef]:
     if resource is None:
         return None
     raw = str(resource).strip()
     if not raw:
         return None
-    parsed = urlsplit(raw)
-    if not parsed.scheme or not parsed.netloc:
+    # Hand-rolled scheme/netloc/path split: urlsplit's generic parser handles
+    # query/fragment/userinfo we never use and costs far more than two finds.
+    scheme_end = raw.find("://")
+    if scheme_end <= 0:
+        return None
+    scheme = raw[:scheme_end]
+    rest = raw[scheme_end + 3 :]
+    slash = rest.find("/")
+    netloc = rest if slash < 0 else rest[:slash]
+    path = "" if slash < 0 else rest[slash:]
+    path = path.partition("?")[0].partition("#")[0]
+    if not netloc:
         return None
-    segments = [segment for segment in parsed.path.split("/") if segment]
-    if segments and segments[-1].strip().lower() == "logs":
-        segments = segments[:-1]
-    resource_logs_prefix = ""
-    resource_id = ""
-    for index, segment in enumerate(segments):
-        if segment.strip().lower() == "resources" and (index + 1) < len(segments):
-            resource_id = unquote(segments[index + 1]).strip()
-            if not resource_id:
-                return None
-            resource_logs_prefix = "/" + "/".join(segments[: index + 1])
-            if resource_logs_prefix == "/":
-                resource_logs_prefix = ""
-            break
-    if not resource_logs_prefix or not resource_id:
+    # One C-level regex pass extracts the prefix and id instead of a
+    # Python-level split/compare loop over the segments.
+    match = _RESOURCE_PATH_RE.match(_TRAILING_LOGS_RE.sub("", path))
+    if match is None:
         return None
+    resource_id = unquote(match.group("rid")).strip()
+    if not resource_id:
+        return None
+    resource_logs_prefix = match.group("prefix")
+    if "//" in resource_logs_prefix:
+        # Collapse duplicate slashes the way the old segment join did.
+        resource_logs_prefix = "/" + "/".join(s for s in resource_logs_prefix.split("/") if s)
     return ParsedResourceRef(
-        resource_base_url=f"{parsed.scheme}://{parsed.netloc}".rstrip("/"),
+        resource_base_url=f"{scheme}://{netloc}".rstrip("/"),
         resource_logs_prefix=resource_logs_prefix,
         resource_id=resource_id,
     )
 
 
-def build_client_config_from_env() -> ClientConfig:
-    resource_env = _parse_resource_reference(os.getenv("ALSHIVAL_RESOURCE") or os.getenv("ALSHIVAL_RESOURCE_URL"))
+@functools.lru_cache(maxsize=4)
+def _build_cfg_cached(snapshot: tuple) -> ClientConfig:
+    values = dict(snapshot)
+    resource_env = _parse_resource_reference(values["ALSHIVAL_RESOURCE"] or values["ALSHIVAL_RESOURCE_URL"])
     default_cloud_level = logging.INFO
 
     if resource_env is not None:
@@ -109,16 +177,44 @@ def build_client_config_from_env() -> ClientConfig:
         resource_id = None
 
     return ClientConfig(
-        username=os.getenv("ALSHIVAL_USERNAME"),
+        username=values["ALSHIVAL_USERNAME"],
         resource_base_url=resource_base_url,
         resource_logs_prefix=resource_logs_prefix,
-        api_key=os.getenv("ALSHIVAL_API_KEY"),
+        api_key=values["ALSHIVAL_API_KEY"],
         resource_id=resource_id,
-        cloud_level=_env_level("ALSHIVAL_CLOUD_LEVEL", default_cloud_level),
+        cloud_level=_env_level(values["ALSHIVAL_CLOUD_LEVEL"], default_cloud_level),
     )
 
 
-_config = build_client_config_from_env()
+def build_client_config_from_env() -> ClientConfig:
+    # The snapshot is taken fresh each call, so a changed environment maps
+    # to a new cache key; an unchanged one re-parses nothing. replace()
+    # hands each caller its own mutable copy of the cached instance.
+    snapshot = tuple((name, os.environ.get(name)) for name in _ALSHIVAL_ENV_KEYS)
+    return replace(_build_cfg_cached(snapshot))
+
+
+# Created empty at import; environment parsing is deferred to the first
+# get_config() call so importers that never log pay nothing. The instance
+# itself is stable — it is populated in place, never rebound.
+_config = ClientConfig()
+_config_loaded = False
+_config_lock = threading.Lock()
+
+
+def _load_env_config() -> None:
+    global _config_loaded
+    with _config_lock:
+        if _config_loaded:
+            return
+        env_cfg = build_client_config_from_env()
+        _config.username = env_cfg.username
+        _config.resource_base_url = env_cfg.resource_base_url
+        _config.resource_logs_prefix = env_cfg.resource_logs_prefix
+        _config.api_key = env_cfg.api_key
+        _config.resource_id = env_cfg.resource_id
+        _config.cloud_level = env_cfg.cloud_level
+        _config_loaded = True
 
 
 def configure(
@@ -130,7 +226,12 @@ def configure(
     cloud_level: Optional[str] = None,
     timeout_seconds: Optional[int] = None,
     verify_ssl: Optional[bool] = None,
+    cloud_batch_size: Optional[int] = None,
+    cloud_flush_interval: Optional[float] = None,
+    cloud_dedupe: Optional[bool] = None,
 ) -> None:
+    # Materialize env-derived defaults before applying overrides.
+    get_config()
     if resource is not None:
         parsed_resource = _parse_resource_reference(resource)
         if parsed_resource is not None:
@@ -154,20 +255,68 @@ def configure(
         _config.timeout_seconds = timeout_seconds
     if verify_ssl is not None:
         _config.verify_ssl = verify_ssl
+    if cloud_batch_size is not None:
+        _config.cloud_batch_size = max(1, int(cloud_batch_size))
+    if cloud_flush_interval is not None:
+        _config.cloud_flush_interval = max(0.0, float(cloud_flush_interval))
+    if cloud_dedupe is not None:
+        _config.cloud_dedupe = cloud_dedupe
+
+
 def build_resource_logs_endpoint(resource_id: str) -> str:
     cfg = get_config()
-    base = str(cfg.resource_base_url or "").strip().rstrip("/")
-    safe_resource = quote(str(resource_id or "").strip(), safe="")
-    resource_logs_prefix = str(cfg.resource_logs_prefix or "").strip()
-    if not base or not resource_logs_prefix:
+    # The template only depends on (base, prefix); recompute it when either
+    # changes (the key check also covers fields mutated outside configure()).
+    key = (cfg.resource_base_url, cfg.resource_logs_prefix)
+    template = cfg._endpoint_template
+    if template is None or cfg._endpoint_key != key:
+        # Config fields are normalized when set (_parse_resource_reference
+        # strips and drops trailing slashes), so no per-call re-cleaning.
+        base = cfg.resource_base_url or ""
+        cleaned_prefix = _cleaned_logs_prefix(cfg.resource_logs_prefix or "")
+        template = f"{base}{cleaned_prefix}/%s/logs/" if base and cleaned_prefix else ""
+        cfg._endpoint_template = template
+        cfg._endpoint_key = key
+        cfg._endpoint_cache = None
+    if not template:
+        return ""
+    cached = cfg._endpoint_cache
+    if cached is not None and cached[0] == resource_id:
+        return cached[1]
+    safe_resource = _fast_quote(str(resource_id or "").strip())
+    endpoint = template % safe_resource
+    cfg._endpoint_cache = (resource_id, endpoint)
+    return endpoint
+
+
+# Memoized prefix normalization: keyed by the raw configured value, so the
+# steady-state endpoint build is a dict hit instead of repeated strips.
+_PREFIX_CACHE: dict[str, str] = {}
+
+
+def _cleaned_logs_prefix(raw: str) -> str:
+    # Unconfigured prefixes are the steady state for partially-set configs;
+    # skip the cache and the strip dance entirely for them.
+    if not raw or raw == "/":
         return ""
-    cleaned_prefix = "/" + resource_logs_prefix.strip("/")
-    return f"{base}{cleaned_prefix}/{safe_resource}/logs/"
+    # Prefixes produced by _parse_resource_reference are already canonical
+    # ("/a/b/c"); accept them as-is without touching the cache or stripping.
+    if raw and raw[0] == "/" and raw[-1] != "/" and "//" not in raw and not raw[-1].isspace():
+        return raw
+    hit = _PREFIX_CACHE.get(raw)
+    if hit is None:
+        # Single strip pass over whitespace and slashes together.
+        stripped = raw.strip(" \t\r\n\v\f/")
+        hit = "/" + stripped if stripped else ""
+        _PREFIX_CACHE[raw] = hit
+    return hit
 
 
 def set_enabled(enabled: bool) -> None:
-    _config.enabled = enabled
+    get_config().enabled = enabled
 
 
 def get_config() -> ClientConfig:
+    if not _config_loaded:
+        _load_env_config()
     return _config
@@ -1,17 +1,44 @@
 from __future__ import annotations
 
+import atexit
+import collections
+import concurrent.futures
 import datetime as dt
+import functools
 import importlib.metadata
+import json
 import logging
+import os
 import threading
+import time
 import traceback
-from typing import Any, Mapping, Optional
+import weakref
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Mapping, Optional
 
-import requests
+if TYPE_CHECKING:
+    import requests
 
-from .client import ALERT_LEVEL, build_resource_logs_endpoint, get_config
+try:
+    # Optional fast JSON encoder; payloads fall back to stdlib json.
+    import orjson
+except ImportError:
+    orjson = None
 
-_RESERVED_RECORD_FIELDS = {
+
+if orjson is not None:
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+else:
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+from .client import ALERT_LEVEL, ClientConfig, build_resource_logs_endpoint, get_config
+
+_RESERVED_RECORD_FIELDS = frozenset({
     "name",
     "msg",
     "args",
@@ -34,14 +61,38 @@ _RESERVED_RECORD_FIELDS = {
     "process",
     "message",
     "asctime",
-}
+})
 
 if logging.getLevelName(ALERT_LEVEL) == f"Level {ALERT_LEVEL}":
     logging.addLevelName(ALERT_LEVEL, "ALERT")
 
+# Reentrancy guard for emit(); a ContextVar read is a single C-level probe of
+# the current context, cheaper than a threading.local attribute lookup, and it
+# also covers async tasks sharing one thread.
+_IN_EMIT: ContextVar[bool] = ContextVar("alshival_in_emit", default=False)
+
 
-def _utc_now_iso() -> str:
-    return dt.datetime.now(dt.timezone.utc).isoformat()
+_UTC = dt.timezone.utc
+
+
+def _iso_ts(created: float) -> str:
+    # Millisecond precision matches what record.created reliably carries and
+    # keeps the formatted string short.
+    return dt.datetime.fromtimestamp(created, _UTC).isoformat(timespec="milliseconds")
+
+
+def _json_native(value: Any) -> bool:
+    """One non-copying pass checking a value is encodable as-is.
+
+    Tuples count as non-native so both JSON encoders see plain lists.
+    """
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return True
+    if isinstance(value, list):
+        return all(_json_native(item) for item in value)
+    if isinstance(value, dict):
+        return all(type(key) is str and _json_native(item) for key, item in value.items())
+    return False
 
 
 def _safe_value(value: Any) -> Any:
@@ -54,7 +105,13 @@ def _safe_value(value: Any) -> Any:
     return str(value)
 
 
+_SDK_NAME = "alshival-python"
+
+
+@functools.lru_cache(maxsize=1)
 def _sdk_version() -> str:
+    # The installed version cannot change within a process; the metadata
+    # walk is paid once, on the first delivered batch.
     try:
         return importlib.metadata.version("alshival")
     except importlib.metadata.PackageNotFoundError:
@@ -66,11 +123,227 @@ def _debug(msg: str) -> None:
     return
 
 
+# Cloud delivery is decoupled from emit(): records are queued here and a
+# background worker batches them into one POST per (endpoint, headers,
+# resource) group, amortizing TLS/HTTP round-trips across records. Batch
+# size and flush interval come from the config (cloud_batch_size /
+# cloud_flush_interval).
+# Leave a batch whose oldest entry is still this fresh for the next pass,
+# so synchronous _flush_queue() callers (shutdown hooks, tests) deliver it
+# instead of the worker. Keyed on the oldest entry so a steady trickle of
+# records cannot postpone the interval flush indefinitely.
+_LINGER = 0.05
+
+# Queued entries: (enqueued_at, endpoint, headers items, resource_id,
+# timeout, verify, log dict). Oldest entries are dropped on overflow.
+_QUEUE: collections.deque = collections.deque(maxlen=10_000)
+_QUEUE_COND = threading.Condition()
+_WORKER: Optional[threading.Thread] = None
+_WORKER_LOCK = threading.Lock()
+_SESSION: Optional["requests.Session"] = None
+_SESSION_LOCK = threading.Lock()
+_EXECUTOR: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _EXECUTOR
+    executor = _EXECUTOR
+    if executor is None:
+        with _EXECUTOR_LOCK:
+            executor = _EXECUTOR
+            if executor is None:
+                try:
+                    workers = int(os.environ.get("ALSHIVAL_HTTP_CONCURRENCY", "4"))
+                except ValueError:
+                    workers = 4
+                executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=max(1, workers),
+                    thread_name_prefix="alshival-post",
+                )
+                _EXECUTOR = executor
+    return executor
+
+
+def _get_session() -> "requests.Session":
+    global _SESSION
+    session = _SESSION
+    if session is None:
+        with _SESSION_LOCK:
+            session = _SESSION
+            if session is None:
+                # Imported on first delivery so `import alshival` doesn't pay
+                # for requests/urllib3 when no record is ever forwarded.
+                import requests
+                from requests.adapters import HTTPAdapter, Retry
+
+                session = requests.Session()
+                # One host, possibly several posting threads: keep a small
+                # warm pool so batches reuse TCP/TLS instead of re-handshaking.
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=16,
+                    max_retries=Retry(
+                        total=2,
+                        backoff_factor=0.1,
+                        status_forcelist=(502, 503, 504),
+                        allowed_methods=frozenset({"POST"}),
+                    ),
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _SESSION = session
+    return session
+
+
+def _ensure_worker() -> None:
+    global _WORKER
+    if _WORKER is not None and _WORKER.is_alive():
+        return
+    with _WORKER_LOCK:
+        if _WORKER is None or not _WORKER.is_alive():
+            worker = threading.Thread(target=_drain_loop, name="alshival-cloud-logs", daemon=True)
+            worker.start()
+            _WORKER = worker
+
+
+def _drain_loop() -> None:
+    # The worker thread only delivers; flag it for its lifetime so records
+    # logged by the transport itself (urllib3 connection chatter) are not
+    # re-enqueued through an attached handler.
+    _IN_EMIT.set(True)
+    while True:
+        try:
+            cfg = get_config()
+            with _QUEUE_COND:
+                _QUEUE_COND.wait(timeout=cfg.cloud_flush_interval or 0.05)
+            try:
+                # A concurrent flush() can empty the deque at any point; the
+                # subscript is the racy read, so take it under IndexError.
+                oldest_at = _QUEUE[0][0]
+            except IndexError:
+                continue
+            if len(_QUEUE) < cfg.cloud_batch_size and time.monotonic() - oldest_at < _LINGER:
+                continue
+            _post_batches(_drain(), parallel=True)
+        except Exception:
+            # Fail-safe telemetry: the worker must outlive races with
+            # concurrent flushes and the RuntimeError an executor submit
+            # raises once interpreter shutdown has begun.
+            continue
+
+
+def _drain() -> list[tuple]:
+    entries: list[tuple] = []
+    # popleft is atomic, so draining needs no lock against concurrent emits.
+    while True:
+        try:
+            entries.append(_QUEUE.popleft())
+        except IndexError:
+            return entries
+
+
+def _post_batches(entries: list[tuple], *, parallel: bool = False) -> None:
+    if not entries:
+        return
+    groups: dict[tuple, list[dict]] = {}
+    for _enqueued_at, endpoint, headers, resource_id, timeout, verify, log in entries:
+        groups.setdefault((endpoint, headers, resource_id, timeout, verify), []).append(log)
+    if parallel and len(groups) > 1:
+        # Independent (endpoint, credentials) groups can be posted
+        # concurrently; waiting on the futures keeps drain-loop backpressure.
+        futures = [_get_executor().submit(_post_group, key, logs) for key, logs in groups.items()]
+        concurrent.futures.wait(futures)
+        return
+    for key, logs in groups.items():
+        _post_group(key, logs)
+
+
+def _post_group(key: tuple, logs: list[dict]) -> None:
+    # Posting can run on executor threads and on synchronous flush()
+    # callers; hold the reentrancy flag so transport-level log records
+    # cannot re-enter emit and refill the queue mid-delivery.
+    token = _IN_EMIT.set(True)
+    try:
+        endpoint, headers, resource_id, timeout, verify = key
+        payload: dict[str, Any] = {
+            "resource_id": resource_id,
+            "sdk": _SDK_NAME,
+            "sdk_version": _sdk_version(),
+            "logs": logs,
+        }
+        post_headers = dict(headers)
+        post_headers["content-type"] = "application/json"
+        try:
+            resp = _get_session().post(
+                endpoint,
+                data=_dumps(payload),
+                headers=post_headers,
+                timeout=timeout,
+                verify=verify,
+            )
+            if getattr(resp, "status_code", 0) >= 400:
+                _debug(f"cloud log post failed: status={resp.status_code}")
+        except Exception as exc:
+            # Fail-safe telemetry: delivery errors are never raised.
+            _debug(f"cloud log post failed: {exc!r}")
+    finally:
+        _IN_EMIT.reset(token)
+
+
+def _delivery_headers(cfg: ClientConfig) -> tuple:
+    """Header items for cloud posts, memoized on the config per credentials."""
+    key = (cfg.api_key, cfg.username)
+    cached = cfg._headers_cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    headers = {"x-api-key": cfg.api_key or ""}
+    if cfg.username:
+        headers["x-user-username"] = cfg.username
+    items = tuple(headers.items())
+    cfg._headers_cache = (key, items)
+    return items
+
+
+def _flush_queue() -> None:
+    _post_batches(_drain())
+
+
+def _shutdown() -> None:
+    # Deliver whatever is still queued, then release the pooled connections;
+    # closing first would tear the pools out from under the final flush.
+    _flush_queue()
+    session = _SESSION
+    if session is not None:
+        session.close()
+
+
+atexit.register(_shutdown)
+
+
+class _CloudGateFilter(logging.Filter):
+    """Runs the handler's forwarding gate from inside Handler.handle().
+
+    Filters are consulted before the handler lock is acquired and emit is
+    dispatched, so below-threshold or unconfigured records cost a single
+    filter call instead of a lock round-trip plus a full emit.
+    """
+
+    def __init__(self, handler: "CloudLogHandler") -> None:
+        super().__init__()
+        self._handler = handler
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return self._handler._should_forward(get_config(), record)
+
+
 class CloudLogHandler(logging.Handler):
     """Stdlib logging handler that forwards records to Alshival Cloud Logs.
 
     Records are forwarded only when record.levelno >= configured cloud level.
-    Calls never raise (fail-safe telemetry).
+    Forwarded records are queued and delivered in batches by a background
+    thread; call flush() to deliver synchronously. Calls never raise
+    (fail-safe telemetry).
     """
 
     def __init__(
@@ -82,34 +355,40 @@ class CloudLogHandler(logging.Handler):
         super().__init__()
         self.resource_id = resource_id
         self.cloud_level = cloud_level
-        self._local = threading.local()
+        # (gate field values, forwarding active, effective min level) memo;
+        # recomputed whenever enabled/cloud_level/api_key change.
+        self._gate: Optional[tuple] = None
+        # (dedupe key, entry dict) of the most recently enqueued record;
+        # used to collapse identical consecutive records when enabled.
+        self._last_dup: Optional[tuple] = None
+        if cloud_level is not None:
+            # Mirror the explicit threshold on the handler level so stdlib
+            # logging culls below-threshold records before emit is dispatched.
+            self.setLevel(cloud_level)
+        self.addFilter(_CloudGateFilter(self))
+
+    def createLock(self) -> None:
+        # emit() only builds a payload and appends to the thread-safe deque,
+        # so the stdlib per-handler lock buys nothing; a None lock makes
+        # acquire()/release() in Handler.handle() no-ops.
+        self.lock = None
 
     def _resource_endpoint(self, resource_id: str) -> str:
         return build_resource_logs_endpoint(resource_id)
 
-    def _session(self) -> requests.Session:
-        # requests.Session is not documented as thread-safe; keep one per thread.
-        session = getattr(self._local, "session", None)
-        if session is None:
-            session = requests.Session()
-            self._local.session = session
-        return session
-
-    def _should_forward(self, record: logging.LogRecord) -> bool:
-        cfg = get_config()
-        if not cfg.enabled:
-            return False
-        if cfg.cloud_level is None:
-            return False
-        min_level = self.cloud_level if self.cloud_level is not None else cfg.cloud_level
-        if record.levelno < min_level:
-            return False
-        if not cfg.api_key:
-            return False
-        return True
-
-    def _resolved_resource_id(self, record: logging.LogRecord) -> str:
-        cfg = get_config()
+    def _should_forward(self, cfg: ClientConfig, record: logging.LogRecord) -> bool:
+        gate = self._gate
+        # Keyed on the field values themselves, like the endpoint and header
+        # caches, so the memo also honors fields mutated outside configure().
+        key = (cfg.enabled, cfg.cloud_level, cfg.api_key)
+        if gate is None or gate[0] != key:
+            active = bool(cfg.enabled and cfg.cloud_level is not None and cfg.api_key)
+            min_level = self.cloud_level if self.cloud_level is not None else (cfg.cloud_level or 0)
+            gate = (key, active, min_level)
+            self._gate = gate
+        return gate[1] and record.levelno >= gate[2]
+
+    def _resolved_resource_id(self, cfg: ClientConfig, record: logging.LogRecord) -> str:
         # Prefer explicit override passed via the handler, then record extra, then global config.
         candidates = [
             self.resource_id,
@@ -122,15 +401,14 @@ class CloudLogHandler(logging.Handler):
         return ""
 
     def emit(self, record: logging.LogRecord) -> None:
-        if getattr(self._local, "in_emit", False):
+        if _IN_EMIT.get():
             return
-        self._local.in_emit = True
+        token = _IN_EMIT.set(True)
         try:
-            if not self._should_forward(record):
-                return
-
+            # _CloudGateFilter already vetted the record in handle(); resolve
+            # the config once here and reuse it in every helper below.
             cfg = get_config()
-            resolved_resource = self._resolved_resource_id(record)
+            resolved_resource = self._resolved_resource_id(cfg, record)
             if not resolved_resource:
                 _debug("skipping cloud log: missing resource target (set ALSHIVAL_RESOURCE or pass resource_id)")
                 return
@@ -144,73 +422,115 @@ class CloudLogHandler(logging.Handler):
                 "path": record.pathname,
             }
 
-            extra_fields = {
-                key: _safe_value(value)
-                for key, value in record.__dict__.items()
-                if key not in _RESERVED_RECORD_FIELDS
-            }
-            if extra_fields:
+            # C-level set difference first: the common record carries no
+            # extras, so skip the per-attribute loop entirely in that case.
+            extra_keys = record.__dict__.keys() - _RESERVED_RECORD_FIELDS
+            if extra_keys:
+                extra_fields: dict[str, Any] = {}
+                for key in extra_keys:
+                    value = record.__dict__[key]
+                    # Pass already-encodable values through untouched; only
+                    # structures with foreign types pay the coercing copy.
+                    extra_fields[key] = value if _json_native(value) else _safe_value(value)
                 details["extra"] = extra_fields
 
             if record.exc_info:
-                details["exception"] = "".join(traceback.format_exception(*record.exc_info))
+                # Reuse stdlib Formatter's per-record cache: another handler
+                # may already have formatted the traceback, and stashing ours
+                # spares whoever formats this record next.
+                if not record.exc_text:
+                    record.exc_text = "".join(traceback.format_exception(*record.exc_info))
+                details["exception"] = record.exc_text
             if record.stack_info:
                 details["stack_info"] = record.stack_info
 
-            payload: dict[str, Any] = {
-                "resource_id": resolved_resource,
-                "sdk": "alshival-python",
-                "sdk_version": _sdk_version(),
-                "logs": [
-                    {
-                        "level": record.levelname.lower(),
-                        "message": message,
-                        "logger": record.name,
-                        "ts": _utc_now_iso(),
-                        "extra": details,
-                    }
-                ],
+            entry = {
+                "level": record.levelname.lower(),
+                "message": message,
+                "logger": record.name,
+                "ts": _iso_ts(record.created),
+                "extra": details,
             }
 
+            if cfg.cloud_dedupe:
+                # record.msg plus record.args (not getMessage()) so records
+                # collapse only when their formatted output would match,
+                # without paying the formatting; the resolved resource keeps
+                # records bound for different targets apart. The key is only
+                # ever ==-compared, so unhashable args are fine.
+                key = (record.levelno, record.name, record.msg, record.args, resolved_resource)
+                last = self._last_dup
+                if last is not None and last[0] == key and _QUEUE and _QUEUE[-1][6] is last[1]:
+                    # Still queued: bump the count in place instead of
+                    # enqueueing a copy. Once drained, the identity check
+                    # fails and a fresh entry is enqueued as usual.
+                    last[1]["count"] += 1
+                    return
+                # Seed the count now so later bumps never resize the dict
+                # while a drain may be serializing it.
+                entry["count"] = 1
+                self._last_dup = (key, entry)
+
             endpoint = self._resource_endpoint(resolved_resource)
             if not endpoint:
                 _debug("skipping cloud log: missing route target (set ALSHIVAL_RESOURCE)")
                 return
-            headers = {"x-api-key": cfg.api_key or ""}
-            if cfg.username:
-                headers["x-user-username"] = cfg.username
-            try:
-                resp = self._session().post(
+            # Delivery context is captured now so a later configure() cannot
+            # retarget records that were already accepted.
+            if len(_QUEUE) == _QUEUE.maxlen:
+                _debug("cloud log queue full: dropping oldest record")
+            _QUEUE.append(
+                (
+                    time.monotonic(),
                     endpoint,
-                    json=payload,
-                    headers=headers,
-                    timeout=cfg.timeout_seconds,
-                    verify=cfg.verify_ssl,
+                    _delivery_headers(cfg),
+                    resolved_resource,
+                    cfg.timeout_seconds,
+                    cfg.verify_ssl,
+                    entry,
                 )
-                if getattr(resp, "status_code", 0) >= 400:
-                    _debug(f"cloud log post failed: status={resp.status_code}")
-            except Exception as exc:
-                _debug(f"cloud log post failed: {exc!r}")
-                return
+            )
+            if len(_QUEUE) >= cfg.cloud_batch_size:
+                with _QUEUE_COND:
+                    _QUEUE_COND.notify()
+            _ensure_worker()
         except Exception:
             # Logging handlers should never raise into host applications.
             self.handleError(record)
         finally:
-            self._local.in_emit = False
+            _IN_EMIT.reset(token)
+
+    def flush(self) -> None:
+        _flush_queue()
 
 
 # Backwards-compatible alias (older name).
 AlshivalLogHandler = CloudLogHandler
 
 
+# Per-logger registry of attached cloud handlers keyed by resource_id.
+# Every attach path funnels through _dedupe_add_handler, so a dict probe
+# replaces the isinstance scan over logger.handlers; weak logger keys let
+# dynamically created loggers be collected normally.
+_ATTACHED: "weakref.WeakKeyDictionary[logging.Logger, dict[Optional[str], CloudLogHandler]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
 def _dedupe_add_handler(target: logging.Logger, handler: CloudLogHandler) -> CloudLogHandler:
-    for existing in target.handlers:
-        if isinstance(existing, CloudLogHandler) and getattr(existing, "resource_id", None) == handler.resource_id:
-            # Allow "reattaching" to update cloud_level/resource binding without duplicating handlers.
-            if handler.cloud_level is not None:
-                existing.cloud_level = handler.cloud_level
-            return existing
+    by_resource = _ATTACHED.setdefault(target, {})
+    existing = by_resource.get(handler.resource_id)
+    # Identity-check against target.handlers: callers may clear a logger's
+    # handler list behind our back, which must invalidate the registry hit.
+    if existing is not None and existing in target.handlers:
+        # Allow "reattaching" to update cloud_level/resource binding without duplicating handlers.
+        if handler.cloud_level is not None:
+            existing.cloud_level = handler.cloud_level
+            existing.setLevel(handler.cloud_level)
+            existing._gate = None
+        return existing
     target.addHandler(handler)
+    by_resource[handler.resource_id] = handler
     return handler
 
 
@@ -244,8 +564,15 @@ class AlshivalLogger:
             "cloud_level": cfg.cloud_level,
             "timeout_seconds": cfg.timeout_seconds,
             "verify_ssl": cfg.verify_ssl,
+            "cloud_batch_size": cfg.cloud_batch_size,
+            "cloud_flush_interval": cfg.cloud_flush_interval,
+            "cloud_dedupe": cfg.cloud_dedupe,
         }
 
+    def flush(self) -> None:
+        """Synchronously deliver any cloud log records still queued."""
+        _flush_queue()
+
     def _with_resource(self, kwargs: dict[str, Any], resource_id: Optional[str]) -> dict[str, Any]:
         if not resource_id:
             return kwargs
@@ -3,91 +3,143 @@ import os
 import sys
 import unittest
 from pathlib import Path
-from unittest import mock
+
+# Resolved once at import; the resolve() readlink/stat walk is not repeated
+# by class setup.
+_SDK_SRC = str(Path(__file__).resolve().parents[1] / "src")
+
+
+# Field values setUp restores before each test. ClientConfig is slotted, so
+# the reset walks this precomputed tuple with setattr rather than merging
+# into an instance __dict__.
+_CFG_DEFAULTS = (
+    ("username", None),
+    ("resource_base_url", None),
+    ("resource_logs_prefix", None),
+    ("api_key", None),
+    ("resource_id", None),
+    ("enabled", True),
+    ("cloud_level", logging.INFO),
+)
+
+
+# Resource URL fixtures and the config fields each should parse into; one
+# subTest per row replaces a near-identical test method per route shape.
+_RESOURCE_URL_CASES = (
+    (
+        "https://alshival.ai/DevTools/u/alshival/resources/abc-123/",
+        {
+            "resource_base_url": "https://alshival.ai",
+            "resource_logs_prefix": "/DevTools/u/alshival/resources",
+            "resource_id": "abc-123",
+        },
+    ),
+    (
+        "https://alshival.dev/u/alshival/resources/r-123/logs/",
+        {
+            "resource_base_url": "https://alshival.dev",
+            "resource_logs_prefix": "/u/alshival/resources",
+            "resource_id": "r-123",
+        },
+    ),
+    (
+        "https://selfhost.example/team/devops/resources/r-123/",
+        {
+            "resource_base_url": "https://selfhost.example",
+            "resource_logs_prefix": "/team/devops/resources",
+            "resource_id": "r-123",
+        },
+    ),
+)
+
+# Expected endpoint URLs shared by the endpoint-builder tests.
+_EP_TEAM_OVERRIDE = "https://dev.alshival.dev/team/Starwood/resources/override-r/logs/"
+
+# Config fields derived from a resource URL, compared in one dict equality
+# per test so a failure diffs all three at once.
+_PARSE_ATTRS = ("resource_base_url", "resource_logs_prefix", "resource_id")
+
+
+def _parsed_fields(cfg) -> dict:
+    return {name: getattr(cfg, name) for name in _PARSE_ATTRS}
 
 
 class TestClientCompat(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Put the src path on sys.path once for the class; per-test
+        # insertion re-ran this list shift for every method.
+        sys.path.insert(0, _SDK_SRC)
+        # Bind the module and the client symbols once; per-test imports paid
+        # the import-machinery lookups on every method.
+        import alshival
+        from alshival.client import (
+            build_client_config_from_env,
+            build_resource_logs_endpoint,
+            get_config,
+        )
+
+        cls.alshival = alshival
+        cls.get_config = staticmethod(get_config)
+        cls.build_endpoint = staticmethod(build_resource_logs_endpoint)
+        cls.build_env = staticmethod(build_client_config_from_env)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        if _SDK_SRC in sys.path:
+            sys.path.remove(_SDK_SRC)
+
     def setUp(self) -> None:
-        self._sdk_src = str(Path(__file__).resolve().parents[1] / "src")
-        sys.path.insert(0, self._sdk_src)
-        from alshival.client import get_config  # noqa: PLC0415
-
-        cfg = get_config()
-        cfg.username = None
-        cfg.resource_base_url = None
-        cfg.resource_logs_prefix = None
-        cfg.api_key = None
-        cfg.resource_id = None
-        cfg.enabled = True
-        cfg.cloud_level = logging.INFO
-
-    def tearDown(self) -> None:
-        if sys.path and sys.path[0] == self._sdk_src:
-            sys.path.pop(0)
-
-    def test_configure_resource_url_parses_user_route(self) -> None:
-        import alshival  # noqa: PLC0415
-        from alshival.client import get_config  # noqa: PLC0415
-
-        alshival.configure(resource="https://alshival.ai/DevTools/u/alshival/resources/abc-123/")
-        cfg = get_config()
-        self.assertEqual(cfg.resource_base_url, "https://alshival.ai")
-        self.assertEqual(cfg.resource_logs_prefix, "/DevTools/u/alshival/resources")
-        self.assertEqual(cfg.resource_id, "abc-123")
-
-    def test_configure_resource_url_accepts_logs_suffix(self) -> None:
-        import alshival  # noqa: PLC0415
-        from alshival.client import get_config  # noqa: PLC0415
-
-        alshival.configure(resource="https://alshival.dev/u/alshival/resources/r-123/logs/")
-        cfg = get_config()
-        self.assertEqual(cfg.resource_base_url, "https://alshival.dev")
-        self.assertEqual(cfg.resource_logs_prefix, "/u/alshival/resources")
-        self.assertEqual(cfg.resource_id, "r-123")
-
-    def test_configure_resource_url_parses_team_route(self) -> None:
-        import alshival  # noqa: PLC0415
-        from alshival.client import get_config  # noqa: PLC0415
-
-        alshival.configure(resource="https://selfhost.example/team/devops/resources/r-123/")
-        cfg = get_config()
-        self.assertEqual(cfg.resource_base_url, "https://selfhost.example")
-        self.assertEqual(cfg.resource_logs_prefix, "/team/devops/resources")
-        self.assertEqual(cfg.resource_id, "r-123")
+        cfg = self.get_config()
+        for name, value in _CFG_DEFAULTS:
+            setattr(cfg, name, value)
+
+    def test_configure_resource_url_parses_each_route(self) -> None:
+        # Covers the user route with a portal prefix, the logs/ suffix, and
+        # the team route; setUp's reset is replayed between cases.
+        for url, expected in _RESOURCE_URL_CASES:
+            with self.subTest(url=url):
+                cfg = self.get_config()
+                for name, value in _CFG_DEFAULTS:
+                    setattr(cfg, name, value)
+                self.alshival.configure(resource=url)
+                self.assertEqual(_parsed_fields(cfg), expected)
 
     def test_resource_endpoint_prefers_parsed_resource_prefix(self) -> None:
-        import alshival  # noqa: PLC0415
-        from alshival.client import build_resource_logs_endpoint  # noqa: PLC0415
-
-        alshival.configure(resource="https://dev.alshival.dev/team/Starwood/resources/5176/")
-        endpoint = build_resource_logs_endpoint("override-r")
-        self.assertEqual(
-            endpoint,
-            "https://dev.alshival.dev/team/Starwood/resources/override-r/logs/",
-        )
+        self.alshival.configure(resource="https://dev.alshival.dev/team/Starwood/resources/5176/")
+        endpoint = self.build_endpoint("override-r")
+        self.assertEqual(endpoint, _EP_TEAM_OVERRIDE)
 
     def test_resource_endpoint_empty_without_resource_context(self) -> None:
-        from alshival.client import build_resource_logs_endpoint  # noqa: PLC0415
-
-        endpoint = build_resource_logs_endpoint("r-123")
+        endpoint = self.build_endpoint("r-123")
         self.assertEqual(endpoint, "")
 
     def test_env_resource_url_wins_and_base_url_env_ignored(self) -> None:
-        from alshival.client import build_client_config_from_env  # noqa: PLC0415
+        # Two keys don't warrant mock.patch.dict's copy/enter/exit
+        # machinery; stash and restore them directly.
+        overrides = {
+            "ALSHIVAL_BASE_URL": "https://ignored.example",
+            "ALSHIVAL_RESOURCE": "https://alshival.dev/u/owner-user/resources/r-123/",
+        }
+        saved = {key: os.environ.get(key) for key in overrides}
+        os.environ.update(overrides)
+        try:
+            cfg = self.build_env()
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
 
-        with mock.patch.dict(
-            os.environ,
+        self.assertEqual(
+            _parsed_fields(cfg),
             {
-                "ALSHIVAL_BASE_URL": "https://ignored.example",
-                "ALSHIVAL_RESOURCE": "https://alshival.dev/u/owner-user/resources/r-123/",
+                "resource_base_url": "https://alshival.dev",
+                "resource_logs_prefix": "/u/owner-user/resources",
+                "resource_id": "r-123",
             },
-            clear=False,
-        ):
-            cfg = build_client_config_from_env()
-
-        self.assertEqual(cfg.resource_base_url, "https://alshival.dev")
-        self.assertEqual(cfg.resource_logs_prefix, "/u/owner-user/resources")
-        self.assertEqual(cfg.resource_id, "r-123")
+        )
 
 
 if __name__ == "__main__":
@@ -1,33 +1,77 @@
+import json
 import logging
 import sys
 import unittest
 from unittest import mock
 from pathlib import Path
 
+# Resolved once for the whole module; inserted ahead of everything so we
+# import the SDK package, not similarly named local modules.
+_SDK_SRC = str(Path(__file__).resolve().parents[1] / "src")
+
+alshival = None
+get_config = None
+build_client_config_from_env = None
+
+# Field values setUp restores before each test; applied with setattr since
+# ClientConfig is slotted.
+_CFG_DEFAULTS = (
+    ("username", None),
+    ("resource_base_url", None),
+    ("resource_logs_prefix", None),
+    ("api_key", None),
+    ("resource_id", None),
+    ("enabled", True),
+    ("cloud_level", logging.INFO),
+)
+
+
+def setUpModule() -> None:
+    global alshival, get_config, build_client_config_from_env
+    if _SDK_SRC not in sys.path:
+        sys.path.insert(0, _SDK_SRC)
+    import alshival as _alshival
+    from alshival.client import build_client_config_from_env as _build, get_config as _get
+
+    alshival = _alshival
+    get_config = _get
+    build_client_config_from_env = _build
+
+
+class _ListHandler(logging.Handler):
+    """Capture handler defined once for the module; emit is bound straight
+    to list.append so captured records skip the formatting machinery."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+        self.emit = self.records.append  # type: ignore[method-assign]
+
+
+def _reset_cfg() -> None:
+    cfg = get_config()
+    for name, value in _CFG_DEFAULTS:
+        setattr(cfg, name, value)
+
 
 class TestLoggingCompat(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # One patcher for the whole class instead of a context manager per
+        # test. autospec is deliberately off so call_args keeps the plain
+        # (url, ...) positional shape the assertions below rely on.
+        cls._post_patcher = mock.patch("requests.Session.post")
+        cls._post = cls._post_patcher.start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._post_patcher.stop()
+
     def setUp(self) -> None:
-        # Ensure we import the SDK package, not similarly named local modules.
-        self._sdk_src = str(Path(__file__).resolve().parents[1] / "src")
-        sys.path.insert(0, self._sdk_src)
-        from alshival.client import get_config  # noqa: PLC0415
-
-        cfg = get_config()
-        cfg.username = None
-        cfg.resource_base_url = None
-        cfg.resource_logs_prefix = None
-        cfg.api_key = None
-        cfg.resource_id = None
-        cfg.enabled = True
-        cfg.cloud_level = logging.INFO
-
-    def tearDown(self) -> None:
-        if sys.path and sys.path[0] == self._sdk_src:
-            sys.path.pop(0)
+        _reset_cfg()
+        self._post.reset_mock()
 
     def test_cloud_level_filters_only_cloud_handler(self) -> None:
-        import alshival  # noqa: PLC0415
-
         alshival.configure(
             username="u",
             api_key="k",
@@ -37,30 +81,22 @@ class TestLoggingCompat(unittest.TestCase):
         )
 
         # Attach a capture handler to verify the log record is still emitted normally.
-        capture = []
-
-        class Capture(logging.Handler):
-            def emit(self, record: logging.LogRecord) -> None:  # noqa: ANN001
-                capture.append(record)
-
         base_logger = alshival.log._logger  # type: ignore[attr-defined]
-        cap_h = Capture()
+        cap_h = _ListHandler()
         cap_h.setLevel(logging.DEBUG)
         base_logger.addHandler(cap_h)
         base_logger.setLevel(logging.DEBUG)
 
         try:
-            with mock.patch("requests.Session.post") as post:
-                base_logger.propagate = False
-                alshival.log.info("hello")
-                self.assertEqual(len(capture), 1)
-                post.assert_not_called()
+            base_logger.propagate = False
+            alshival.log.info("hello")
+            alshival.log.flush()
+            self.assertEqual(len(cap_h.records), 1)
+            self._post.assert_not_called()
         finally:
             base_logger.removeHandler(cap_h)
 
     def test_debug_method_forwards_when_cloud_level_debug(self) -> None:
-        import alshival  # noqa: PLC0415
-
         root_logger = logging.getLogger()
         original_root_level = root_logger.level
         root_logger.setLevel(logging.WARNING)
@@ -72,15 +108,13 @@ class TestLoggingCompat(unittest.TestCase):
                 enabled=True,
                 cloud_level="DEBUG",
             )
-            with mock.patch("requests.Session.post") as post:
-                alshival.log.debug("debug event")
-                self.assertTrue(post.called)
+            alshival.log.debug("debug event")
+            alshival.log.flush()
+            self.assertTrue(self._post.called)
         finally:
             root_logger.setLevel(original_root_level)
 
     def test_attach_is_deduped(self) -> None:
-        import alshival  # noqa: PLC0415
-
         logger = logging.getLogger("test.alshival.dedupe")
         logger.handlers.clear()
         h1 = alshival.attach(logger)
@@ -88,8 +122,6 @@ class TestLoggingCompat(unittest.TestCase):
         self.assertIs(h1, h2)
 
     def test_resource_id_override_via_kwarg(self) -> None:
-        import alshival  # noqa: PLC0415
-
         alshival.configure(
             username="u",
             api_key="k",
@@ -97,15 +129,13 @@ class TestLoggingCompat(unittest.TestCase):
             enabled=True,
             cloud_level="INFO",
         )
-        with mock.patch("requests.Session.post") as post:
-            alshival.log.error("boom", resource_id="override-r")
-            self.assertTrue(post.called)
-            args, kwargs = post.call_args
-            self.assertIn("/resources/override-r/logs/", args[0])
+        alshival.log.error("boom", resource_id="override-r")
+        alshival.log.flush()
+        self.assertTrue(self._post.called)
+        args, kwargs = self._post.call_args
+        self.assertIn("/resources/override-r/logs/", args[0])
 
     def test_cloud_level_disable_token_skips_forwarding(self) -> None:
-        import alshival  # noqa: PLC0415
-
         alshival.configure(
             username="u",
             api_key="k",
@@ -113,27 +143,21 @@ class TestLoggingCompat(unittest.TestCase):
             enabled=True,
             cloud_level="NONE",
         )
-        with mock.patch("requests.Session.post") as post:
-            alshival.log.error("cloud forwarding disabled")
-            post.assert_not_called()
+        alshival.log.error("cloud forwarding disabled")
+        alshival.log.flush()
+        self._post.assert_not_called()
 
     def test_env_cloud_level_none_token_parses_as_disabled(self) -> None:
-        from alshival.client import build_client_config_from_env  # noqa: PLC0415
-
         with mock.patch.dict("os.environ", {"ALSHIVAL_CLOUD_LEVEL": "NONE"}, clear=True):
             cfg_none = build_client_config_from_env()
         self.assertIsNone(cfg_none.cloud_level)
 
     def test_env_cloud_level_invalid_value_falls_back_to_default(self) -> None:
-        from alshival.client import build_client_config_from_env  # noqa: PLC0415
-
         with mock.patch.dict("os.environ", {"ALSHIVAL_CLOUD_LEVEL": "false"}, clear=True):
             cfg_invalid = build_client_config_from_env()
         self.assertEqual(cfg_invalid.cloud_level, logging.INFO)
 
     def test_alert_level_and_tag_supported(self) -> None:
-        import alshival  # noqa: PLC0415
-
         alshival.configure(
             username="u",
             api_key="k",
@@ -141,27 +165,24 @@ class TestLoggingCompat(unittest.TestCase):
             enabled=True,
             cloud_level="ALERT",
         )
-        with mock.patch("requests.Session.post") as post:
-            alshival.log.error("below alert threshold")
-            post.assert_not_called()
-
-            alshival.log.alert("urgent incident")
-            self.assertTrue(post.called)
-            _args, kwargs = post.call_args
-            payload = kwargs.get("json") or {}
-            logs = payload.get("logs") or []
-            self.assertTrue(logs)
-            self.assertEqual(str(logs[0].get("level") or ""), "alert")
+        alshival.log.error("below alert threshold")
+        alshival.log.flush()
+        self._post.assert_not_called()
+
+        alshival.log.alert("urgent incident")
+        alshival.log.flush()
+        self.assertTrue(self._post.called)
+        _args, kwargs = self._post.call_args
+        payload = json.loads(kwargs.get("data") or b"{}")
+        logs = payload.get("logs") or []
+        self.assertTrue(logs)
+        self.assertEqual(str(logs[0].get("level") or ""), "alert")
 
     def test_configure_cloud_level_rejects_non_string_values(self) -> None:
-        import alshival  # noqa: PLC0415
-
         with self.assertRaises(ValueError):
             alshival.configure(cloud_level=logging.ERROR)  # type: ignore[arg-type]
 
     def test_shared_resource_uses_owner_path_with_actor_headers(self) -> None:
-        import alshival  # noqa: PLC0415
-
         alshival.configure(
             username="viewer-user",
             api_key="k",
@@ -169,19 +190,23 @@ class TestLoggingCompat(unittest.TestCase):
             enabled=True,
             cloud_level="INFO",
         )
-        with mock.patch("requests.Session.post") as post:
-            alshival.log.info("shared write")
-            self.assertTrue(post.called)
-            args, kwargs = post.call_args
-            self.assertIn("/u/owner-user/resources/r/logs/", args[0])
-            headers = kwargs.get("headers") or {}
-            self.assertEqual(headers.get("x-api-key"), "k")
-            self.assertEqual(headers.get("x-user-username"), "viewer-user")
-            self.assertNotIn("x-user-email", headers)
+        alshival.log.info("shared write")
+        alshival.log.flush()
+        self.assertTrue(self._post.called)
+        args, kwargs = self._post.call_args
+        self.assertIn("/u/owner-user/resources/r/logs/", args[0])
+        # Full-dict equality also proves no stray headers (x-user-email)
+        # are sent.
+        self.assertEqual(
+            kwargs.get("headers"),
+            {
+                "x-api-key": "k",
+                "x-user-username": "viewer-user",
+                "content-type": "application/json",
+            },
+        )
 
     def test_team_resource_uses_team_path_with_actor_headers(self) -> None:
-        import alshival  # noqa: PLC0415
-
         alshival.configure(
             username="viewer-user",
             api_key="k",
@@ -189,19 +214,23 @@ class TestLoggingCompat(unittest.TestCase):
             enabled=True,
             cloud_level="INFO",
         )
-        with mock.patch("requests.Session.post") as post:
-            alshival.log.info("team write")
-            self.assertTrue(post.called)
-            args, kwargs = post.call_args
-            self.assertIn("/team/devops/resources/r/logs/", args[0])
-            headers = kwargs.get("headers") or {}
-            self.assertEqual(headers.get("x-api-key"), "k")
-            self.assertEqual(headers.get("x-user-username"), "viewer-user")
-            self.assertNotIn("x-user-email", headers)
+        alshival.log.info("team write")
+        alshival.log.flush()
+        self.assertTrue(self._post.called)
+        args, kwargs = self._post.call_args
+        self.assertIn("/team/devops/resources/r/logs/", args[0])
+        # Full-dict equality also proves no stray headers (x-user-email)
+        # are sent.
+        self.assertEqual(
+            kwargs.get("headers"),
+            {
+                "x-api-key": "k",
+                "x-user-username": "viewer-user",
+                "content-type": "application/json",
+            },
+        )
 
     def test_cloud_send_without_username_uses_resource_url(self) -> None:
-        import alshival  # noqa: PLC0415
-
         alshival.configure(
             username="",
             api_key="k",
@@ -209,14 +238,16 @@ class TestLoggingCompat(unittest.TestCase):
             enabled=True,
             cloud_level="INFO",
         )
-        with mock.patch("requests.Session.post") as post:
-            alshival.log.info("shared write without username")
-            self.assertTrue(post.called)
-            args, kwargs = post.call_args
-            self.assertIn("/u/owner-user/resources/r/logs/", args[0])
-            headers = kwargs.get("headers") or {}
-            self.assertEqual(headers.get("x-api-key"), "k")
-            self.assertNotIn("x-user-username", headers)
+        alshival.log.info("shared write without username")
+        alshival.log.flush()
+        self.assertTrue(self._post.called)
+        args, kwargs = self._post.call_args
+        self.assertIn("/u/owner-user/resources/r/logs/", args[0])
+        # No username configured: equality proves x-user-username is absent.
+        self.assertEqual(
+            kwargs.get("headers"),
+            {"x-api-key": "k", "content-type": "application/json"},
+        )
 
 
 if __name__ == "__main__":